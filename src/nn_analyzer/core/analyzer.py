@@ -1,8 +1,52 @@
 """Neural network architecture analyzer."""
 
-from typing import List, Tuple, Dict, Any
+from dataclasses import dataclass
+from itertools import count
+from typing import List, Tuple, Dict, Any, Union, NamedTuple
+import threading
+import numpy as np
 from .layers import Layer
 
+# Versions are drawn from one process-wide counter so that a version number
+# identifies a single network state even across analyzer instances
+_versions = count(1)
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """Analysis of a single layer in the network."""
+    
+    layer_index: int
+    layer_name: str
+    layer_info: Dict[str, Any]
+    input_shape: Tuple[int, int, int]
+    output_shape: Tuple[int, int, int]
+    parameters: int
+    receptive_field: Union[int, str]
+    effective_stride: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the plain dict form used by the public API."""
+        return {
+            'layer_index': self.layer_index,
+            'layer_name': self.layer_name,
+            'layer_info': self.layer_info,
+            'input_shape': self.input_shape,
+            'output_shape': self.output_shape,
+            'parameters': self.parameters,
+            'receptive_field': self.receptive_field,
+            'effective_stride': self.effective_stride
+        }
+
+
+class Snapshot(NamedTuple):
+    """Immutable view of the network and its analysis at one version."""
+    version: int
+    input_shape: Tuple[int, int, int]
+    layers: Tuple[Layer, ...]
+    summary: Dict[str, Any]
+    details: Tuple[Dict[str, Any], ...]
+
 
 class NetworkAnalyzer:
     """Analyzes neural network architectures."""
@@ -14,72 +58,275 @@ class NetworkAnalyzer:
         Args:
             input_shape: Input shape as (height, width, channels)
         """
-        self.input_shape = input_shape
+        self._input_shape = input_shape
         self.layers: List[Layer] = []
-        self.analysis_results: List[Dict[str, Any]] = []
+        self.analysis_results: List[AnalysisResult] = []
+        
+        # Dict form of analysis_results, maintained alongside it for the public API
+        self._details: List[Dict[str, Any]] = []
+        
+        # Running state at the tail of the network, used to seed the next layer
+        self._current_shape = input_shape
+        self._current_rf = 1
+        self._current_stride = 1
+        
+        # Running parameter total, kept in sync by _append_analysis/_update_analysis
+        self._total_params = 0
+        
+        # Changed on every change to the network; keys the snapshot
+        self._version = next(_versions)
+        
+        # Guards all mutation; readers use the snapshot, which is swapped atomically
+        self._lock = threading.RLock()
+        self._snapshot = self._build_snapshot()
+    
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever the network is modified."""
+        return self._version
+    
+    @property
+    def input_shape(self) -> Tuple[int, int, int]:
+        """Input shape as (height, width, channels)."""
+        return self._input_shape
+    
+    @input_shape.setter
+    def input_shape(self, input_shape: Tuple[int, int, int]) -> None:
+        with self._lock:
+            self._input_shape = input_shape
+            self._update_analysis()
+    
+    def reset(self, input_shape: Tuple[int, int, int]) -> None:
+        """Remove all layers and start over with a new input shape."""
+        with self._lock:
+            self.layers.clear()
+            self._input_shape = input_shape
+            self._update_analysis()
     
     def add_layer(self, layer: Layer) -> None:
-        """Add a layer to the network."""
-        self.layers.append(layer)
-        self._update_analysis()
+        """Add a layer to the network, analyzing only the new layer."""
+        with self._lock:
+            # Analyze first: if the layer fails, the network is left as it was
+            self._append_analysis(len(self.layers), layer)
+            self.layers.append(layer)
+            self._version = next(_versions)
+    
+    def add_layers(self, layers: List[Layer]) -> None:
+        """
+        Add several layers to the network as a single change.
+
+        Either all layers are added or, if any of them fails, none are.
+        """
+        if not layers:
+            return
+        with self._lock:
+            start = len(self.layers)
+            try:
+                for index, layer in enumerate(layers, start):
+                    self._append_analysis(index, layer)
+            except Exception:
+                self._truncate_analysis(start)
+                raise
+            self.layers.extend(layers)
+            self._version = next(_versions)
     
     def remove_layer(self, index: int) -> None:
         """Remove a layer at the given index."""
-        if 0 <= index < len(self.layers):
-            self.layers.pop(index)
-            self._update_analysis()
+        with self._lock:
+            if 0 <= index < len(self.layers):
+                self.layers.pop(index)
+                self._version = next(_versions)
+                self._truncate_analysis(index)
+                
+                # Only the layers after the removed one need to be re-analyzed
+                for i in range(index, len(self.layers)):
+                    self._append_analysis(i, self.layers[i])
     
     def clear_layers(self) -> None:
         """Clear all layers."""
-        self.layers.clear()
-        self.analysis_results.clear()
+        with self._lock:
+            self.layers.clear()
+            self._update_analysis()
+    
+    def copy(self) -> 'NetworkAnalyzer':
+        """
+        Get a snapshot of the network and its analysis at the current version.
+        
+        Layers and analysis records are shared with the original (neither is
+        mutated once created), so the copy is cheap and can be read from another
+        thread while the original keeps changing.
+        """
+        clone = NetworkAnalyzer.__new__(NetworkAnalyzer)
+        with self._lock:
+            clone._input_shape = self._input_shape
+            clone.layers = list(self.layers)
+            clone.analysis_results = list(self.analysis_results)
+            clone._details = list(self._details)
+            clone._current_shape = self._current_shape
+            clone._current_rf = self._current_rf
+            clone._current_stride = self._current_stride
+            clone._total_params = self._total_params
+            clone._version = self._version
+            clone._snapshot = self.snapshot()
+        clone._lock = threading.RLock()
+        return clone
+    
+    def _truncate_analysis(self, length: int) -> None:
+        """Drop analysis results from index `length` on and restore the tail state."""
+        for result in self.analysis_results[length:]:
+            self._total_params -= result.parameters
+        del self.analysis_results[length:]
+        del self._details[length:]
+        
+        if not self.analysis_results:
+            self._current_shape = self._input_shape
+            self._current_stride = 1
+        else:
+            self._current_shape = self.analysis_results[-1].output_shape
+            self._current_stride = self.analysis_results[-1].effective_stride
+        
+        # Global layers leave the receptive field unchanged, so the running
+        # value is the one reported by the last non-global layer
+        self._current_rf = 1
+        for result in reversed(self.analysis_results):
+            if result.receptive_field != 'Global':
+                self._current_rf = result.receptive_field
+                break
     
     def _update_analysis(self) -> None:
         """Update the analysis results for all layers."""
         self.analysis_results.clear()
+        self._details.clear()
+        self._version = next(_versions)
+        
+        self._current_shape = self._input_shape
+        self._current_rf = 1
+        self._current_stride = 1
+        self._total_params = 0
         
         if not self.layers:
             return
         
-        current_shape = self.input_shape
-        current_rf = 1
-        current_stride = 1
-        
-        for i, layer in enumerate(self.layers):
-            # Calculate output shape
-            output_shape = layer.calculate_output_shape(current_shape)
-            
-            # Calculate parameters
-            parameters = layer.calculate_parameters(current_shape)
-            
-            # Calculate receptive field
-            rf, stride = layer.calculate_receptive_field(current_rf, current_stride)
-            
-            # Store results
-            result = {
-                'layer_index': i,
-                'layer_name': layer.name,
-                'layer_info': layer.get_layer_info(),
-                'input_shape': current_shape,
-                'output_shape': output_shape,
-                'parameters': parameters,
-                'receptive_field': rf if rf != float('inf') else 'Global',
-                'effective_stride': stride
-            }
-            
-            self.analysis_results.append(result)
-            
-            # Update for next iteration
-            current_shape = output_shape
-            current_rf = rf if rf != float('inf') else current_rf
-            current_stride = stride
+        # Receptive field recurrence r_l = r_{l-1} + (k_l - 1) * s_{l-1}, with
+        # s_l = s_{l-1} * stride_l, evaluated for all layers at once
+        geometry = np.array(
+            [layer.get_receptive_field_geometry() if layer.CHANGES_RF else (1, 1)
+             for layer in self.layers],
+            dtype=np.int64
+        )
+        kernel_sizes = geometry[:, 0]
+        strides = geometry[:, 1]
+        
+        # Every RF is at most layers * kernel * total stride; if that may not fit
+        # in int64, fall back to the per-layer path, which uses Python ints
+        bits = np.log2(strides).sum() + np.log2(kernel_sizes.max()) + np.log2(len(self.layers))
+        if not bits < 62:
+            for i, layer in enumerate(self.layers):
+                self._append_analysis(i, layer)
+            return
+        
+        effective_strides = np.cumprod(strides)
+        input_strides = np.concatenate(([1], effective_strides[:-1]))
+        receptive_fields = 1 + np.cumsum((kernel_sizes - 1) * input_strides)
+        
+        for i, (layer, rf, stride) in enumerate(zip(
+                self.layers, receptive_fields.tolist(), effective_strides.tolist())):
+            self._append_result(i, layer, rf, stride)
+    
+    def _append_analysis(self, index: int, layer: Layer) -> None:
+        """Analyze a single layer on top of the current tail state."""
+        if not layer.CHANGES_RF:
+            self._append_result(index, layer, self._current_rf, self._current_stride)
+            return
+        
+        rf, stride = layer.calculate_receptive_field(self._current_rf, self._current_stride)
+        if layer.GLOBAL_RF:
+            # Global layers report RF_INFINITY; the running RF carries on unchanged
+            rf = self._current_rf
+        self._append_result(index, layer, rf, stride)
+    
+    def _append_result(self, index: int, layer: Layer, rf: int, stride: int) -> None:
+        """Record a layer's analysis given its receptive field and stride."""
+        # Output shape and parameters, memoized on the layer for its input shape
+        output_shape, parameters = layer.bind(self._current_shape)
+        
+        self._record(index, layer, output_shape, parameters, rf, stride)
+    
+    def _record(self, index: int, layer: Layer, output_shape: Tuple[int, int, int],
+                parameters: int, rf: int, stride: int) -> None:
+        """Store a layer's analysis and advance the tail state."""
+        current_shape = self._current_shape
+        
+        # Store results
+        result = AnalysisResult(
+            layer_index=index,
+            layer_name=layer.name,
+            layer_info=layer.get_layer_info(),
+            input_shape=current_shape,
+            output_shape=output_shape,
+            parameters=parameters,
+            receptive_field='Global' if layer.GLOBAL_RF else rf,
+            effective_stride=stride
+        )
+        
+        details = result.to_dict()
+        total_params = self._total_params + parameters
+        
+        # Nothing is stored until every value above has been computed
+        self.analysis_results.append(result)
+        self._details.append(details)
+        
+        # Update tail state for the next layer
+        self._current_shape = output_shape
+        self._current_rf = rf
+        self._current_stride = stride
+        self._total_params = total_params
     
     def get_total_parameters(self) -> int:
         """Get total number of parameters in the network."""
-        return sum(result['parameters'] for result in self.analysis_results)
+        return self._total_params
+    
+    def snapshot(self) -> Snapshot:
+        """
+        Get a consistent view of the network at its current version.
+        
+        The snapshot is built at most once per version and shared between
+        callers, so its summary and details must be treated as read-only.
+        """
+        snapshot = self._snapshot
+        if snapshot.version != self._version:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot.version != self._version:
+                    snapshot = self._snapshot = self._build_snapshot()
+        return snapshot
+    
+    def _build_snapshot(self) -> Snapshot:
+        """Build the snapshot from the current state; called with the lock held."""
+        return Snapshot(
+            version=self._version,
+            input_shape=self._input_shape,
+            layers=tuple(self.layers),
+            summary=self._build_summary(),
+            details=tuple(self._details)
+        )
+    
+    def get_analysis(self) -> Tuple[Dict[str, Any], Tuple[Dict[str, Any], ...]]:
+        """
+        Get the analysis summary and per-layer details together.
+        
+        Both come from the same snapshot and are shared between callers, so
+        they must be treated as read-only.
+        """
+        snapshot = self.snapshot()
+        return snapshot.summary, snapshot.details
     
     def get_analysis_summary(self) -> Dict[str, Any]:
         """Get a summary of the network analysis."""
+        return self.get_analysis()[0].copy()
+    
+    def _build_summary(self) -> Dict[str, Any]:
+        """Build the summary dict from the current analysis results."""
         if not self.analysis_results:
             return {
                 'input_shape': self.input_shape,
@@ -93,27 +340,36 @@ class NetworkAnalyzer:
         
         return {
             'input_shape': self.input_shape,
-            'output_shape': final_result['output_shape'],
+            'output_shape': final_result.output_shape,
             'total_parameters': self.get_total_parameters(),
             'total_layers': len(self.layers),
-            'final_receptive_field': final_result['receptive_field']
+            'final_receptive_field': final_result.receptive_field
         }
     
     def get_layer_details(self) -> List[Dict[str, Any]]:
         """Get detailed analysis for each layer."""
-        return self.analysis_results.copy()
+        return list(self.get_analysis()[1])
+    
+    def get_layer_details_view(self) -> List[AnalysisResult]:
+        """
+        Get the live per-layer analysis records without copying.
+        
+        The returned list is owned by the analyzer and must be treated as read-only.
+        """
+        return self.analysis_results
     
     def export_architecture(self) -> Dict[str, Any]:
         """Export the complete architecture configuration."""
+        snapshot = self.snapshot()
         return {
-            'input_shape': self.input_shape,
+            'input_shape': snapshot.input_shape,
             'layers': [
                 {
                     'name': layer.name,
                     'config': layer.get_layer_info()
                 }
-                for layer in self.layers
+                for layer in snapshot.layers
             ],
-            'analysis': self.get_analysis_summary(),
-            'layer_details': self.get_layer_details()
+            'analysis': snapshot.summary.copy(),
+            'layer_details': list(snapshot.details)
         }
@@ -1,19 +1,35 @@
 """Generate neural network architecture diagrams."""
 
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib.patches as patches
 from matplotlib.patches import FancyBboxPatch
+from matplotlib.collections import PatchCollection, LineCollection
 import numpy as np
-from typing import List, Dict, Any, Tuple
+import math
+from typing import List, Dict, Any, Tuple, Optional
 import io
 import base64
-from .analyzer import NetworkAnalyzer
+import hashlib
+from pathlib import Path
+from functools import lru_cache
+from .analyzer import NetworkAnalyzer, AnalysisResult
 
 
 class DiagramGenerator:
     """Generates visual diagrams of neural network architectures."""
     
-    def __init__(self):
+    def __init__(self, render: bool = True):
+        """
+        Initialize the generator.
+        
+        Args:
+            render: Whether diagrams are drawn at all; when False, generate_diagram_lazy
+                skips matplotlib entirely
+        """
+        self.render = render
         self.colors = {
             'Conv2D': '#FF6B6B',
             'MaxPool2D': '#4ECDC4',
@@ -28,29 +44,105 @@ class DiagramGenerator:
             'output': '#FD79A8'
         }
         
+        # Legend content is static, so build its handles once
+        legend_types = ['Conv2D', 'MaxPool2D', 'AvgPool2D', 'BatchNorm2D', 'Dropout', 'Flatten', 'Dense', 'Activation']
+        self._legend_labels = [t for t in legend_types if t in self.colors]
+        self._legend_handles = [
+            patches.Rectangle((0, 0), 1, 1, facecolor=self.colors[t], edgecolor='black', alpha=0.8)
+            for t in self._legend_labels
+        ]
+        
+        # Activation symbol curves, translated to the layer position at draw time
+        t = np.linspace(-0.3, 0.3, 50)
+        self._act_curves = {
+            'relu': (t, np.maximum(0, t * 2)),
+            'sigmoid': (t, 1 / (1 + np.exp(-t * 5)) - 0.5),
+            'tanh': (t, np.tanh(t * 3) * 0.3),
+            'linear': (t, t.copy()),
+        }
+        
         self.box_height = 1.0
         self.box_spacing = 2.0
         self.text_size = 10
+        
+        # Drawing routine per layer type; anything else uses _draw_special_layer
+        self._draw_dispatch = {
+            # Draw as 3D-looking feature maps
+            'Conv2D': self._draw_feature_maps_adapter,
+            'MaxPool2D': self._draw_feature_maps_adapter,
+            'AvgPool2D': self._draw_feature_maps_adapter,
+            'GlobalAvgPool2D': self._draw_feature_maps_adapter,
+            'BatchNorm2D': self._draw_feature_maps_adapter,
+            'input': self._draw_feature_maps_adapter,
+            # Draw as neural network nodes
+            'Dense': self._draw_dense_nodes_adapter,
+            'output': self._draw_dense_nodes_adapter,
+            # Draw as transformation symbol
+            'Flatten': self._draw_flatten_symbol_adapter,
+        }
+        
+        # Reusable figure, canvas and axes; cleared instead of recreated per render
+        self._fig = Figure(figsize=(16, 10))
+        self._fig.patch.set_facecolor('white')
+        self._canvas = FigureCanvasAgg(self._fig)
+        self._ax = self._fig.add_subplot(1, 1, 1)
+        
+        # tight_layout moves the axes; each render starts again from these margins
+        subplotpars = self._fig.subplotpars
+        self._subplot_margins = {
+            'left': subplotpars.left, 'right': subplotpars.right,
+            'bottom': subplotpars.bottom, 'top': subplotpars.top
+        }
+        
+        # Patches queued by the _draw_* helpers, flushed as a single collection
+        self._patches: List[patches.Patch] = []
+        
+        # Connection arrows (x1, x2) queued by _draw_connection_arrow
+        self._arrows: List[Tuple[float, float]] = []
+        
+        # PNG output buffer, rewound and reused by every render
+        self._png_buf = io.BytesIO()
+        
+        # Last rendered image, reused while the network is unchanged
+        self._last_analyzer: Optional[NetworkAnalyzer] = None
+        self._last_version = -1
+        self._last_dpi: Optional[int] = None
+        self._last_key: Optional[bytes] = None
+        self._last_b64: Optional[str] = None
     
-    def generate_diagram(self, analyzer: NetworkAnalyzer, save_path: str = None) -> str:
+    def generate_diagram(self, analyzer: NetworkAnalyzer, save_path: str = None, dpi: int = 100,
+                         high_dpi: bool = False) -> str:
         """
         Generate a diagram of the neural network architecture.
         
         Args:
             analyzer: NetworkAnalyzer instance with layers
             save_path: Optional path to save the diagram
+            dpi: Resolution of the rendered image; browsers scale it for display
+            high_dpi: Write save_path at 300 dpi for print-quality output
             
         Returns:
             Base64 encoded image string
         """
-        # Clear any existing plots
-        plt.clf()
-        
-        # Create figure and axis with improved dimensions
-        fig, ax = plt.subplots(1, 1, figsize=(16, 10))
+        # Reuse the last image if the network has not changed since it was drawn
+        if save_path is None:
+            if (analyzer is self._last_analyzer and analyzer.version == self._last_version
+                    and dpi == self._last_dpi):
+                return self._last_b64
+            key = self._fingerprint(analyzer, dpi)
+            if key == self._last_key:
+                self._remember(analyzer, dpi, key, self._last_b64)
+                return self._last_b64
+        
+        # Reuse the pooled figure, clearing the previous render
+        fig, ax = self._fig, self._ax
+        ax.cla()
+        fig.subplots_adjust(**self._subplot_margins)
+        self._patches = []
+        self._arrows = []
         
         # Get analysis results
-        layer_details = analyzer.get_layer_details()
+        layer_details = analyzer.get_layer_details_view()
         summary = analyzer.get_analysis_summary()
         
         # Calculate total width needed
@@ -63,24 +155,21 @@ class DiagramGenerator:
         ax.set_aspect('equal')
         ax.axis('off')
         
-        # Set background color
-        fig.patch.set_facecolor('white')
-        
         # Draw input
         self._draw_layer_visual(ax, 0, analyzer.input_shape, 'Input', 'input', 0)
         
         # Draw layers
         for i, layer_detail in enumerate(layer_details):
             x_pos = (i + 1) * self.box_spacing
-            layer_info = layer_detail['layer_info']
+            layer_info = layer_detail.layer_info
             layer_type = layer_info['type']
             
             # Create layer label
             layer_label = self._create_layer_label(layer_detail)
             
             self._draw_layer_visual(
-                ax, x_pos, layer_detail['output_shape'], 
-                layer_label, layer_type, layer_detail['parameters']
+                ax, x_pos, layer_detail.output_shape, 
+                layer_label, layer_type, layer_detail.parameters
             )
             
             # Draw connection arrow with improved styling
@@ -89,10 +178,16 @@ class DiagramGenerator:
         # Draw output
         if layer_details:
             final_x = len(layer_details) * self.box_spacing
-            final_shape = layer_details[-1]['output_shape']
+            final_shape = layer_details[-1].output_shape
             self._draw_layer_visual(ax, final_x + self.box_spacing, final_shape, 'Output', 'output', 0)
             self._draw_connection_arrow(ax, final_x + 0.8, final_x + self.box_spacing - 0.8)
         
+        self._flush_arrows(ax)
+        
+        # Flush all queued patches as one artist, keeping their own styles and draw order
+        ax.add_collection(PatchCollection(self._patches, match_original=True))
+        self._patches = []
+        
         # Add title and summary
         title = f"Neural Network Architecture\nTotal Parameters: {summary['total_parameters']:,}"
         if summary['final_receptive_field'] != 'Global':
@@ -100,55 +195,105 @@ class DiagramGenerator:
         else:
             title += f" | Final RF: Global"
         
-        plt.title(title, fontsize=14, fontweight='bold', pad=20)
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
         
         # Add legend
         self._add_legend(ax, total_width)
         
         # Adjust layout
-        plt.tight_layout()
-        
-        # Save if path provided
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.tight_layout()
         
-        # Convert to base64 string
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
+        # Rasterize and encode once; the same PNG bytes serve the file and the base64 payload
+        buffer = self._png_buf
         buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
-        buffer.close()
+        buffer.truncate(0)
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight',
+                    pil_kwargs={'optimize': False, 'compress_level': 1})
+        
+        with buffer.getbuffer() as png_bytes:
+            # Save if path provided
+            if save_path:
+                if high_dpi or Path(save_path).suffix.lower() not in ('', '.png'):
+                    fig.savefig(save_path, dpi=300 if high_dpi else dpi, bbox_inches='tight')
+                else:
+                    with open(save_path, 'wb') as f:
+                        f.write(png_bytes)
+            
+            # Convert to base64 string
+            image_base64 = base64.b64encode(png_bytes).decode('ascii')
         
-        plt.close()
+        # Only a completed render may be reused, so the cache is updated last
+        if save_path is None:
+            self._remember(analyzer, dpi, key, image_base64)
         
         return image_base64
     
+    def _remember(self, analyzer: NetworkAnalyzer, dpi: int, key: bytes, image_base64: str) -> None:
+        """Record the image rendered for the analyzer's current version at this dpi."""
+        self._last_analyzer = analyzer
+        self._last_version = analyzer.version
+        self._last_dpi = dpi
+        self._last_key = key
+        self._last_b64 = image_base64
+    
+    def generate_diagram_lazy(self, analyzer: NetworkAnalyzer, dpi: int = 100) -> Optional[str]:
+        """
+        Generate the diagram only when rendering is enabled and there is something to draw.
+        
+        Returns:
+            Base64 encoded image string, or None if rendering was skipped
+        """
+        if not self.render or not analyzer.layers:
+            return None
+        return self.generate_diagram(analyzer, dpi=dpi)
+    
+    def _fingerprint(self, analyzer: NetworkAnalyzer, dpi: int) -> bytes:
+        """Hash everything that affects the rendered diagram."""
+        state = (dpi, analyzer.input_shape, [(layer.name, layer.get_layer_info()) for layer in analyzer.layers])
+        return hashlib.blake2b(repr(state).encode(), digest_size=16).digest()
+    
     def _draw_layer_visual(self, ax, x: float, shape: Tuple[int, int, int], 
                           label: str, layer_type: str, parameters: int):
         """Draw a sophisticated visual representation of a layer."""
-        h, w, c = shape
-        
         # Get color for layer type
         color = self.colors.get(layer_type, '#CCCCCC')
         
-        if layer_type in ['Conv2D', 'MaxPool2D', 'AvgPool2D', 'GlobalAvgPool2D', 'BatchNorm2D', 'input']:
-            # Draw as 3D-looking feature maps
-            self._draw_feature_maps(ax, x, h, w, c, color, label, parameters)
-        elif layer_type in ['Dense', 'output']:
-            # Draw as neural network nodes
-            self._draw_dense_nodes(ax, x, shape, color, label, parameters)
-        elif layer_type in ['Flatten']:
-            # Draw as transformation symbol
-            self._draw_flatten_symbol(ax, x, shape, color, label)
-        else:
-            # Draw as specialized symbols for other layers
-            self._draw_special_layer(ax, x, shape, color, label, layer_type, parameters)
+        # Specialized symbols for layers without a dedicated drawing
+        draw = self._draw_dispatch.get(layer_type, self._draw_special_layer)
+        draw(ax, x, shape, color, label, layer_type, parameters)
+    
+    # Adapters giving each drawing helper the common dispatch signature
+    
+    def _draw_feature_maps_adapter(self, ax, x: float, shape: Tuple[int, int, int], color: str,
+                                   label: str, layer_type: str, parameters: int):
+        h, w, c = shape
+        self._draw_feature_maps(ax, x, h, w, c, color, label, parameters)
+    
+    def _draw_dense_nodes_adapter(self, ax, x: float, shape: Tuple[int, int, int], color: str,
+                                  label: str, layer_type: str, parameters: int):
+        self._draw_dense_nodes(ax, x, shape, color, label, parameters)
+    
+    def _draw_flatten_symbol_adapter(self, ax, x: float, shape: Tuple[int, int, int], color: str,
+                                     label: str, layer_type: str, parameters: int):
+        self._draw_flatten_symbol(ax, x, shape, color, label)
     
     def _draw_feature_maps(self, ax, x: float, h: int, w: int, c: int, color: str, label: str, parameters: int):
         """Draw feature maps as stacked 3D-looking rectangles."""
         # Calculate dimensions based on spatial size
-        base_width = min(max(0.3, np.log10(max(h * w, 1)) * 0.15), 1.0)
+        base_width = min(max(0.3, math.log10(max(h * w, 1)) * 0.15), 1.0)
         base_height = base_width * 0.8
+        half_width = base_width / 2
+        half_height = base_height / 2
+        left = x - half_width
+        right = x + half_width
+        
+        # Vertices of the 3D side and top effect of the front-most map
+        side_points = np.empty((4, 2))
+        side_points[:, 0] = right
+        side_points[:, 1] = (-half_height, -half_height, half_height, half_height)
+        top_points = np.empty((4, 2))
+        top_points[:, 0] = (left, left, right, right)
+        top_points[:, 1] = half_height
         
         # Number of visible channels to draw (max 5 for visual clarity)
         num_visible = min(c, 5)
@@ -159,36 +304,22 @@ class DiagramGenerator:
             offset = i * depth_offset
             
             # Main rectangle
-            rect = FancyBboxPatch(
-                (x - base_width/2 + offset, -base_height/2 + offset),
+            rect = patches.Rectangle(
+                (left + offset, -half_height + offset),
                 base_width, base_height,
-                boxstyle="round,pad=0.02",
                 facecolor=color,
                 edgecolor='black',
                 linewidth=1.0,
                 alpha=0.7 - i*0.1
             )
-            ax.add_patch(rect)
+            self._patches.append(rect)
             
             # Add 3D side effect
             if i == 0:  # Only for the front-most
-                side_points = np.array([
-                    [x + base_width/2, -base_height/2],
-                    [x + base_width/2 + offset, -base_height/2 + offset],
-                    [x + base_width/2 + offset, base_height/2 + offset],
-                    [x + base_width/2, base_height/2]
-                ])
                 side = patches.Polygon(side_points, facecolor=color, alpha=0.5, edgecolor='black', linewidth=0.5)
-                ax.add_patch(side)
-                
-                top_points = np.array([
-                    [x - base_width/2, base_height/2],
-                    [x - base_width/2 + offset, base_height/2 + offset],
-                    [x + base_width/2 + offset, base_height/2 + offset],
-                    [x + base_width/2, base_height/2]
-                ])
+                self._patches.append(side)
                 top = patches.Polygon(top_points, facecolor=color, alpha=0.6, edgecolor='black', linewidth=0.5)
-                ax.add_patch(top)
+                self._patches.append(top)
         
         # Add label
         ax.text(x, -base_height/2 - 0.3, label, ha='center', va='top', 
@@ -201,7 +332,7 @@ class DiagramGenerator:
         
         # Add parameter count
         if parameters > 0:
-            param_text = self._format_parameters(parameters)
+            param_text = _format_parameters(parameters)
             ax.text(x, base_height/2 + 0.15, param_text, ha='center', va='bottom', 
                     fontsize=self.text_size-3, style='italic', color='blue')
     
@@ -229,7 +360,7 @@ class DiagramGenerator:
                 circle = patches.Circle((x, y_pos), node_radius, 
                                       facecolor=color, edgecolor='black', 
                                       linewidth=1, alpha=0.8)
-                ax.add_patch(circle)
+                self._patches.append(circle)
         
         # Add label below
         ax.text(x, -layer_height/2 - 0.3, label, ha='center', va='top', 
@@ -241,7 +372,7 @@ class DiagramGenerator:
         
         # Add parameter count
         if parameters > 0:
-            param_text = self._format_parameters(parameters)
+            param_text = _format_parameters(parameters)
             ax.text(x, layer_height/2 + 0.15, param_text, ha='center', va='bottom', 
                     fontsize=self.text_size-3, style='italic', color='blue')
     
@@ -249,7 +380,7 @@ class DiagramGenerator:
         """Draw flatten layer as transformation arrows."""
         # Draw input representation (small 3D box)
         input_size = 0.3
-        ax.add_patch(FancyBboxPatch(
+        self._patches.append(FancyBboxPatch(
             (x - 0.4 - input_size/2, -input_size/2),
             input_size, input_size,
             boxstyle="round,pad=0.02",
@@ -268,7 +399,7 @@ class DiagramGenerator:
             node_x = start_x + i * node_spacing
             circle = patches.Circle((node_x, 0), 0.03, 
                                   facecolor=color, edgecolor='black', alpha=0.8)
-            ax.add_patch(circle)
+            self._patches.append(circle)
         
         # Add label
         ax.text(x, -0.4, label, ha='center', va='top', 
@@ -293,21 +424,19 @@ class DiagramGenerator:
                 linestyle='--',
                 alpha=0.8
             )
-            ax.add_patch(rect)
+            self._patches.append(rect)
             
         elif layer_type == 'Activation':
-            # Draw as function symbol
-            t = np.linspace(-0.3, 0.3, 50)
-            
             # Draw different curves for different activations
-            if 'relu' in label.lower():
-                y = np.maximum(0, t * 2)  # ReLU curve
-            elif 'sigmoid' in label.lower():
-                y = 1 / (1 + np.exp(-t * 5)) - 0.5  # Sigmoid curve
-            elif 'tanh' in label.lower():
-                y = np.tanh(t * 3) * 0.3  # Tanh curve
+            label_lower = label.lower()
+            if 'relu' in label_lower:
+                t, y = self._act_curves['relu']
+            elif 'sigmoid' in label_lower:
+                t, y = self._act_curves['sigmoid']
+            elif 'tanh' in label_lower:
+                t, y = self._act_curves['tanh']
             else:
-                y = t  # Linear
+                t, y = self._act_curves['linear']
             
             ax.plot(x + t, y, color=color, linewidth=3, alpha=0.8)
             
@@ -321,7 +450,7 @@ class DiagramGenerator:
                 linewidth=1,
                 alpha=0.6
             )
-            ax.add_patch(rect)
+            self._patches.append(rect)
         else:
             # Default representation
             base_width = 0.6
@@ -335,85 +464,84 @@ class DiagramGenerator:
                 linewidth=1,
                 alpha=0.7
             )
-            ax.add_patch(rect)
+            self._patches.append(rect)
         
         # Add label
         ax.text(x, -0.6, label, ha='center', va='top', 
                 fontsize=self.text_size-1, fontweight='bold')
         
         if parameters > 0:
-            param_text = self._format_parameters(parameters)
+            param_text = _format_parameters(parameters)
             ax.text(x, 0.5, param_text, ha='center', va='bottom', 
                     fontsize=self.text_size-3, style='italic', color='blue')
     
-    def _format_parameters(self, parameters: int) -> str:
-        """Format parameter count for display."""
-        if parameters >= 1000000:
-            return f"{parameters/1000000:.1f}M"
-        elif parameters >= 1000:
-            return f"{parameters/1000:.1f}K"
-        else:
-            return f"{parameters}"
-    
     def _draw_connection_arrow(self, ax, x1: float, x2: float):
-        """Draw an enhanced connection arrow between layers."""
-        # Draw main arrow
-        ax.annotate('', xy=(x2, 0), xytext=(x1, 0),
-                   arrowprops=dict(arrowstyle='->', lw=2.5, color='#2C3E50', alpha=0.7))
-        
-        # Add data flow indicator
-        mid_x = (x1 + x2) / 2
-        ax.text(mid_x, 0.1, '→', ha='center', va='bottom', 
-                fontsize=8, color='#2C3E50', alpha=0.6)
+        """Queue a connection arrow between layers; drawn in bulk by _flush_arrows."""
+        self._arrows.append((x1, x2))
+    
+    def _flush_arrows(self, ax):
+        """Draw all queued connection arrows as one line collection plus arrowheads."""
+        if not self._arrows:
+            return
+        ends = np.array(self._arrows)
+        segments = np.zeros((len(ends), 2, 2))
+        segments[:, :, 0] = ends
+        ax.add_collection(LineCollection(segments, colors='#2C3E50', linewidths=2.5, alpha=0.7))
+        ax.scatter(ends[:, 1], np.zeros(len(ends)), marker='>', s=80, c='#2C3E50', alpha=0.7)
+        self._arrows = []
     
-    def _create_layer_label(self, layer_detail: Dict[str, Any]) -> str:
+    def _create_layer_label(self, layer_detail: AnalysisResult) -> str:
         """Create a descriptive label for a layer."""
-        layer_info = layer_detail['layer_info']
-        layer_type = layer_info['type']
-        
-        if layer_type == 'Conv2D':
-            return f"Conv2D\n{layer_info['filters']}@{layer_info['kernel_size']}×{layer_info['kernel_size']}"
-        elif layer_type in ['MaxPool2D', 'AvgPool2D']:
-            return f"{layer_type}\n{layer_info['pool_size']}×{layer_info['pool_size']}"
-        elif layer_type == 'Dropout':
-            return f"Dropout\n{layer_info['rate']}"
-        elif layer_type == 'Dense':
-            activation = layer_info.get('activation', 'linear')
-            return f"Dense\n{layer_info['units']} units\n({activation})"
-        elif layer_type == 'Activation':
-            return f"Activation\n({layer_info['activation']})"
-        elif layer_type == 'Flatten':
-            return "Flatten"
-        else:
-            return layer_type
+        return _layer_label(tuple(layer_detail.layer_info.items()))
     
     def _add_legend(self, ax, total_width: float):
         """Add a legend to the diagram."""
-        legend_elements = []
-        legend_labels = []
-        
-        # Get unique layer types from colors
-        layer_types = ['Conv2D', 'MaxPool2D', 'AvgPool2D', 'BatchNorm2D', 'Dropout', 'Flatten', 'Dense', 'Activation']
-        
-        for layer_type in layer_types:
-            if layer_type in self.colors:
-                legend_elements.append(
-                    patches.Rectangle((0, 0), 1, 1, facecolor=self.colors[layer_type], 
-                                    edgecolor='black', alpha=0.8)
-                )
-                legend_labels.append(layer_type)
-        
         # Position legend at the bottom
-        ax.legend(legend_elements, legend_labels, 
+        ax.legend(self._legend_handles, self._legend_labels, 
                  loc='upper center', bbox_to_anchor=(0.5, -0.1), 
-                 ncol=len(legend_elements), frameon=False)
+                 ncol=len(self._legend_handles), frameon=False)
     
     def generate_detailed_table(self, analyzer: NetworkAnalyzer) -> str:
         """Generate a detailed table of layer information as HTML."""
-        layer_details = analyzer.get_layer_details()
+        layer_details = analyzer.get_layer_details_view()
         summary = analyzer.get_analysis_summary()
         
-        html = """
+        parts = [_TABLE_HEADER]
+        
+        for detail in layer_details:
+            layer_info = detail.layer_info
+            layer_type = layer_info['type']
+            
+            # Format layer configuration
+            config_text = ""
+            if layer_type == 'Conv2D':
+                config_text = "{0}@{1}×{1}, stride={2}".format(
+                    layer_info['filters'], layer_info['kernel_size'], layer_info['stride'])
+            elif layer_type in ['MaxPool2D', 'AvgPool2D']:
+                config_text = "{0}×{0}, stride={1}".format(layer_info['pool_size'], layer_info['stride'])
+            elif layer_type == 'Dropout':
+                config_text = "rate={}".format(layer_info['rate'])
+            
+            parts.append(_TABLE_ROW.format(
+                name=detail.layer_name,
+                config=config_text,
+                type=layer_type,
+                input_shape=_format_shape(detail.input_shape),
+                output_shape=_format_shape(detail.output_shape),
+                params=_format_param_count(detail.parameters),
+                rf=detail.receptive_field
+            ))
+        
+        # Add summary row
+        parts.append(_TABLE_FOOTER.format(
+            params=_format_param_count(summary['total_parameters']),
+            rf=summary['final_receptive_field']
+        ))
+        
+        return "".join(parts)
+
+
+_TABLE_HEADER = """
         <div class="table-container">
             <h3>Layer Details</h3>
             <table class="analysis-table">
@@ -429,68 +557,74 @@ class DiagramGenerator:
                 </thead>
                 <tbody>
         """
-        
-        for detail in layer_details:
-            layer_info = detail['layer_info']
-            layer_type = layer_info['type']
-            
-            # Format layer configuration
-            config_text = ""
-            if layer_type == 'Conv2D':
-                config_text = f"{layer_info['filters']}@{layer_info['kernel_size']}×{layer_info['kernel_size']}, stride={layer_info['stride']}"
-            elif layer_type in ['MaxPool2D', 'AvgPool2D']:
-                config_text = f"{layer_info['pool_size']}×{layer_info['pool_size']}, stride={layer_info['stride']}"
-            elif layer_type == 'Dropout':
-                config_text = f"rate={layer_info['rate']}"
-            
-            # Format shapes
-            input_shape = f"{detail['input_shape'][0]}×{detail['input_shape'][1]}×{detail['input_shape'][2]}"
-            output_shape = f"{detail['output_shape'][0]}×{detail['output_shape'][1]}×{detail['output_shape'][2]}"
-            
-            # Format parameters
-            params = detail['parameters']
-            if params == 0:
-                param_text = "0"
-            elif params >= 1000000:
-                param_text = f"{params:,} ({params/1000000:.1f}M)"
-            elif params >= 1000:
-                param_text = f"{params:,} ({params/1000:.1f}K)"
-            else:
-                param_text = f"{params:,}"
-            
-            # Format receptive field
-            rf = detail['receptive_field']
-            rf_text = str(rf) if rf != 'Global' else 'Global'
-            
-            html += f"""
+
+_TABLE_ROW = """
                     <tr>
-                        <td><strong>{detail['layer_name']}</strong><br><small>{config_text}</small></td>
-                        <td>{layer_type}</td>
+                        <td><strong>{name}</strong><br><small>{config}</small></td>
+                        <td>{type}</td>
                         <td>{input_shape}</td>
                         <td>{output_shape}</td>
-                        <td>{param_text}</td>
-                        <td>{rf_text}</td>
+                        <td>{params}</td>
+                        <td>{rf}</td>
                     </tr>
             """
-        
-        # Add summary row
-        total_params = summary['total_parameters']
-        if total_params >= 1000000:
-            total_param_text = f"{total_params:,} ({total_params/1000000:.1f}M)"
-        elif total_params >= 1000:
-            total_param_text = f"{total_params:,} ({total_params/1000:.1f}K)"
-        else:
-            total_param_text = f"{total_params:,}"
-        
-        html += f"""
+
+_TABLE_FOOTER = """
                     <tr class="summary-row">
                         <td colspan="4"><strong>Total</strong></td>
-                        <td><strong>{total_param_text}</strong></td>
-                        <td><strong>{summary['final_receptive_field']}</strong></td>
+                        <td><strong>{params}</strong></td>
+                        <td><strong>{rf}</strong></td>
                     </tr>
                 </tbody>
             </table>
         </div>
         """
-        
-        return html
+
+
+@lru_cache(maxsize=1024)
+def _format_parameters(parameters: int) -> str:
+    """Format parameter count for display."""
+    if parameters >= 1000000:
+        return f"{parameters/1000000:.1f}M"
+    elif parameters >= 1000:
+        return f"{parameters/1000:.1f}K"
+    else:
+        return f"{parameters}"
+
+
+@lru_cache(maxsize=1024)
+def _layer_label(layer_info_items: Tuple[Tuple[str, Any], ...]) -> str:
+    """Create a diagram label from a layer's info, given as hashable items."""
+    layer_info = dict(layer_info_items)
+    layer_type = layer_info['type']
+    
+    if layer_type == 'Conv2D':
+        return f"Conv2D\n{layer_info['filters']}@{layer_info['kernel_size']}×{layer_info['kernel_size']}"
+    elif layer_type in ['MaxPool2D', 'AvgPool2D']:
+        return f"{layer_type}\n{layer_info['pool_size']}×{layer_info['pool_size']}"
+    elif layer_type == 'Dropout':
+        return f"Dropout\n{layer_info['rate']}"
+    elif layer_type == 'Dense':
+        activation = layer_info.get('activation', 'linear')
+        return f"Dense\n{layer_info['units']} units\n({activation})"
+    elif layer_type == 'Activation':
+        return f"Activation\n({layer_info['activation']})"
+    elif layer_type == 'Flatten':
+        return "Flatten"
+    else:
+        return layer_type
+
+
+def _format_shape(shape: Tuple[int, int, int]) -> str:
+    """Format an (H, W, C) shape for the detailed table."""
+    return "{}×{}×{}".format(*shape)
+
+
+def _format_param_count(params: int) -> str:
+    """Format a parameter count with a K/M suffix for the detailed table."""
+    if params >= 1000000:
+        return "{:,} ({:.1f}M)".format(params, params / 1000000)
+    elif params >= 1000:
+        return "{:,} ({:.1f}K)".format(params, params / 1000)
+    else:
+        return "{:,}".format(params)
@@ -2,14 +2,38 @@
 
 from abc import ABC, abstractmethod
 from typing import Tuple, Dict, Any
-import math
+
+# Receptive field reported by layers that see the whole input; an int so that
+# RF arithmetic stays integral
+RF_INFINITY = 1 << 30
 
 
 class Layer(ABC):
     """Abstract base class for neural network layers."""
     
+    __slots__ = ('name', '_info', '_bound_input_shape', '_bound_output_shape', '_bound_params')
+    
+    # True for layers whose receptive field covers the whole input
+    GLOBAL_RF = False
+    
+    # False for layers that pass the receptive field and stride through unchanged
+    CHANGES_RF = True
+    
     def __init__(self, name: str):
         self.name = name
+        
+        # Output shape and parameter count memoized for the last bound input shape
+        self._bound_input_shape = None
+        self._bound_output_shape = None
+        self._bound_params = None
+    
+    def bind(self, input_shape: Tuple[int, int, int]) -> Tuple[Tuple[int, int, int], int]:
+        """Get (output shape, parameters) for the given input shape, computing them only when it changes."""
+        if input_shape != self._bound_input_shape:
+            self._bound_output_shape = self.calculate_output_shape(input_shape)
+            self._bound_params = self.calculate_parameters(input_shape)
+            self._bound_input_shape = input_shape
+        return self._bound_output_shape, self._bound_params
     
     @abstractmethod
     def calculate_output_shape(self, input_shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
@@ -26,15 +50,27 @@ class Layer(ABC):
         """Calculate receptive field and effective stride."""
         pass
     
+    def get_receptive_field_geometry(self) -> Tuple[int, int]:
+        """
+        Get (kernel extent, stride) as used by the receptive field recurrence.
+        
+        Derived from calculate_receptive_field, so the two cannot disagree: from a
+        1-pixel field at stride 1, rf = input_rf + (k - 1) * input_stride gives k.
+        """
+        rf, stride = self.calculate_receptive_field(1, 1)
+        return (1 if self.GLOBAL_RF else rf), stride
+    
     @abstractmethod
     def get_layer_info(self) -> Dict[str, Any]:
-        """Get layer configuration information."""
+        """Get layer configuration information (shared; treat as read-only)."""
         pass
 
 
 class Conv2DLayer(Layer):
     """Convolutional 2D layer."""
     
+    __slots__ = ('filters', 'kernel_size', 'stride', 'padding', 'activation')
+    
     def __init__(self, filters: int, kernel_size: int, stride: int = 1, 
                  padding: str = 'valid', activation: str = 'relu', name: str = None):
         super().__init__(name or f"Conv2D_{filters}_{kernel_size}x{kernel_size}")
@@ -43,58 +79,73 @@ class Conv2DLayer(Layer):
         self.stride = stride
         self.padding = padding
         self.activation = activation
+        self._info = {
+            'type': 'Conv2D',
+            'filters': self.filters,
+            'kernel_size': self.kernel_size,
+            'stride': self.stride,
+            'padding': self.padding,
+            'activation': self.activation
+        }
     
     def calculate_output_shape(self, input_shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
         h, w, c = input_shape
+        k, s, padding, filters = self.kernel_size, self.stride, self.padding, self.filters
         
-        if self.padding == 'same':
-            out_h = math.ceil(h / self.stride)
-            out_w = math.ceil(w / self.stride)
+        if padding == 'same':
+            out_h = (h + s - 1) // s
+            out_w = (w + s - 1) // s
         else:  # valid padding
-            out_h = math.ceil((h - self.kernel_size + 1) / self.stride)
-            out_w = math.ceil((w - self.kernel_size + 1) / self.stride)
+            out_h = (h - k) // s + 1
+            out_w = (w - k) // s + 1
         
-        return (out_h, out_w, self.filters)
+        return (out_h, out_w, filters)
     
     def calculate_parameters(self, input_shape: Tuple[int, int, int]) -> int:
         _, _, input_channels = input_shape
+        k = self.kernel_size
         # (kernel_size * kernel_size * input_channels + 1) * filters
-        return (self.kernel_size * self.kernel_size * input_channels + 1) * self.filters
+        return (k * k * input_channels + 1) * self.filters
     
     def calculate_receptive_field(self, input_rf: int, input_stride: int) -> Tuple[int, int]:
-        rf = input_rf + (self.kernel_size - 1) * input_stride
-        stride = input_stride * self.stride
+        k, s = self.kernel_size, self.stride
+        rf = input_rf + (k - 1) * input_stride
+        stride = input_stride * s
         return rf, stride
     
     def get_layer_info(self) -> Dict[str, Any]:
-        return {
-            'type': 'Conv2D',
-            'filters': self.filters,
-            'kernel_size': self.kernel_size,
-            'stride': self.stride,
-            'padding': self.padding,
-            'activation': self.activation
-        }
+        return self._info
 
 
-class MaxPool2DLayer(Layer):
-    """Max pooling 2D layer."""
+class Pool2DLayer(Layer):
+    """Shared implementation of 2D pooling layers; subclasses set LAYER_TYPE."""
+    
+    __slots__ = ('pool_size', 'stride', 'padding')
+    
+    LAYER_TYPE = 'Pool2D'
     
     def __init__(self, pool_size: int, stride: int = None, padding: str = 'valid', name: str = None):
-        super().__init__(name or f"MaxPool2D_{pool_size}x{pool_size}")
+        super().__init__(name or f"{self.LAYER_TYPE}_{pool_size}x{pool_size}")
         self.pool_size = pool_size
         self.stride = stride or pool_size
         self.padding = padding
+        self._info = {
+            'type': self.LAYER_TYPE,
+            'pool_size': self.pool_size,
+            'stride': self.stride,
+            'padding': self.padding
+        }
     
     def calculate_output_shape(self, input_shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
         h, w, c = input_shape
+        k, s, padding = self.pool_size, self.stride, self.padding
         
-        if self.padding == 'same':
-            out_h = math.ceil(h / self.stride)
-            out_w = math.ceil(w / self.stride)
+        if padding == 'same':
+            out_h = (h + s - 1) // s
+            out_w = (w + s - 1) // s
         else:  # valid padding
-            out_h = math.ceil((h - self.pool_size + 1) / self.stride)
-            out_w = math.ceil((w - self.pool_size + 1) / self.stride)
+            out_h = (h - k) // s + 1
+            out_w = (w - k) // s + 1
         
         return (out_h, out_w, c)
     
@@ -102,98 +153,77 @@ class MaxPool2DLayer(Layer):
         return 0  # No parameters in pooling layers
     
     def calculate_receptive_field(self, input_rf: int, input_stride: int) -> Tuple[int, int]:
-        rf = input_rf + (self.pool_size - 1) * input_stride
-        stride = input_stride * self.stride
+        k, s = self.pool_size, self.stride
+        rf = input_rf + (k - 1) * input_stride
+        stride = input_stride * s
         return rf, stride
     
     def get_layer_info(self) -> Dict[str, Any]:
-        return {
-            'type': 'MaxPool2D',
-            'pool_size': self.pool_size,
-            'stride': self.stride,
-            'padding': self.padding
-        }
+        return self._info
 
 
-class AvgPool2DLayer(Layer):
+class MaxPool2DLayer(Pool2DLayer):
+    """Max pooling 2D layer."""
+    
+    __slots__ = ()
+    
+    LAYER_TYPE = 'MaxPool2D'
+
+
+class AvgPool2DLayer(Pool2DLayer):
     """Average pooling 2D layer."""
     
-    def __init__(self, pool_size: int, stride: int = None, padding: str = 'valid', name: str = None):
-        super().__init__(name or f"AvgPool2D_{pool_size}x{pool_size}")
-        self.pool_size = pool_size
-        self.stride = stride or pool_size
-        self.padding = padding
+    __slots__ = ()
+    
+    LAYER_TYPE = 'AvgPool2D'
+
+
+class PassthroughLayer(Layer):
+    """Base for layers that keep the input shape, have no parameters and leave the RF unchanged."""
+    
+    __slots__ = ()
+    
+    CHANGES_RF = False
     
     def calculate_output_shape(self, input_shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
-        h, w, c = input_shape
-        
-        if self.padding == 'same':
-            out_h = math.ceil(h / self.stride)
-            out_w = math.ceil(w / self.stride)
-        else:  # valid padding
-            out_h = math.ceil((h - self.pool_size + 1) / self.stride)
-            out_w = math.ceil((w - self.pool_size + 1) / self.stride)
-        
-        return (out_h, out_w, c)
+        return input_shape  # Same shape as input
     
     def calculate_parameters(self, input_shape: Tuple[int, int, int]) -> int:
-        return 0  # No parameters in pooling layers
+        return 0  # No parameters
     
     def calculate_receptive_field(self, input_rf: int, input_stride: int) -> Tuple[int, int]:
-        rf = input_rf + (self.pool_size - 1) * input_stride
-        stride = input_stride * self.stride
-        return rf, stride
+        return input_rf, input_stride  # No change in RF
     
     def get_layer_info(self) -> Dict[str, Any]:
-        return {
-            'type': 'AvgPool2D',
-            'pool_size': self.pool_size,
-            'stride': self.stride,
-            'padding': self.padding
-        }
+        return self._info
 
 
-class BatchNormLayer(Layer):
+class BatchNormLayer(PassthroughLayer):
     """Batch normalization layer."""
     
+    __slots__ = ()
+    
     def __init__(self, name: str = None):
         super().__init__(name or "BatchNorm2D")
-    
-    def calculate_output_shape(self, input_shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
-        return input_shape  # Same shape as input
+        self._info = {
+            'type': 'BatchNorm2D'
+        }
     
     def calculate_parameters(self, input_shape: Tuple[int, int, int]) -> int:
         _, _, channels = input_shape
         # 2 parameters per channel (scale and shift)
         return 2 * channels
-    
-    def calculate_receptive_field(self, input_rf: int, input_stride: int) -> Tuple[int, int]:
-        return input_rf, input_stride  # No change in RF
-    
-    def get_layer_info(self) -> Dict[str, Any]:
-        return {
-            'type': 'BatchNorm2D'
-        }
 
 
-class DropoutLayer(Layer):
+class DropoutLayer(PassthroughLayer):
     """Dropout layer."""
     
+    __slots__ = ('rate',)
+    
     def __init__(self, rate: float = 0.5, name: str = None):
         super().__init__(name or f"Dropout_{rate}")
         self.rate = rate
-    
-    def calculate_output_shape(self, input_shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
-        return input_shape  # Same shape as input
-    
-    def calculate_parameters(self, input_shape: Tuple[int, int, int]) -> int:
-        return 0  # No parameters
-    
-    def calculate_receptive_field(self, input_rf: int, input_stride: int) -> Tuple[int, int]:
-        return input_rf, input_stride  # No change in RF
-    
-    def get_layer_info(self) -> Dict[str, Any]:
-        return {
+        self._info = {
             'type': 'Dropout',
             'rate': self.rate
         }
@@ -202,8 +232,15 @@ class DropoutLayer(Layer):
 class GlobalAvgPool2DLayer(Layer):
     """Global average pooling 2D layer."""
     
+    __slots__ = ()
+    
+    GLOBAL_RF = True
+    
     def __init__(self, name: str = None):
         super().__init__(name or "GlobalAvgPool2D")
+        self._info = {
+            'type': 'GlobalAvgPool2D'
+        }
     
     def calculate_output_shape(self, input_shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
         _, _, c = input_shape
@@ -214,88 +251,77 @@ class GlobalAvgPool2DLayer(Layer):
     
     def calculate_receptive_field(self, input_rf: int, input_stride: int) -> Tuple[int, int]:
         # Global pooling sees the entire feature map
-        return float('inf'), input_stride
+        return RF_INFINITY, input_stride
     
     def get_layer_info(self) -> Dict[str, Any]:
-        return {
-            'type': 'GlobalAvgPool2D'
-        }
+        return self._info
 
 
-class FlattenLayer(Layer):
+class FlattenLayer(PassthroughLayer):
     """Flatten layer to convert 2D feature maps to 1D."""
     
+    __slots__ = ()
+    
     def __init__(self, name: str = None):
         super().__init__(name or "Flatten")
+        self._info = {
+            'type': 'Flatten'
+        }
     
     def calculate_output_shape(self, input_shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
         h, w, c = input_shape
         flattened_size = h * w * c
         return (1, 1, flattened_size)
-    
-    def calculate_parameters(self, input_shape: Tuple[int, int, int]) -> int:
-        return 0  # No parameters
-    
-    def calculate_receptive_field(self, input_rf: int, input_stride: int) -> Tuple[int, int]:
-        return input_rf, input_stride  # No change in RF
-    
-    def get_layer_info(self) -> Dict[str, Any]:
-        return {
-            'type': 'Flatten'
-        }
 
 
 class DenseLayer(Layer):
     """Dense/Linear layer for classification and regression."""
     
+    __slots__ = ('units', 'activation', 'use_bias')
+    
+    CHANGES_RF = False
+    
     def __init__(self, units: int, activation: str = 'relu', use_bias: bool = True, name: str = None):
         super().__init__(name or f"Dense_{units}")
         self.units = units
         self.activation = activation
         self.use_bias = use_bias
+        self._info = {
+            'type': 'Dense',
+            'units': self.units,
+            'activation': self.activation,
+            'use_bias': self.use_bias
+        }
     
     def calculate_output_shape(self, input_shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
         return (1, 1, self.units)
     
     def calculate_parameters(self, input_shape: Tuple[int, int, int]) -> int:
         h, w, c = input_shape
+        units = self.units
         input_size = h * w * c
         # weights + bias (if used)
-        params = input_size * self.units
+        params = input_size * units
         if self.use_bias:
-            params += self.units
+            params += units
         return params
     
     def calculate_receptive_field(self, input_rf: int, input_stride: int) -> Tuple[int, int]:
         return input_rf, input_stride  # No change in RF
     
     def get_layer_info(self) -> Dict[str, Any]:
-        return {
-            'type': 'Dense',
-            'units': self.units,
-            'activation': self.activation,
-            'use_bias': self.use_bias
-        }
+        return self._info
 
 
-class ActivationLayer(Layer):
+class ActivationLayer(PassthroughLayer):
     """Standalone activation layer."""
     
+    __slots__ = ('activation',)
+    
     def __init__(self, activation: str = 'relu', name: str = None):
         super().__init__(name or f"Activation_{activation}")
         self.activation = activation
-    
-    def calculate_output_shape(self, input_shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
-        return input_shape  # Same shape as input
-    
-    def calculate_parameters(self, input_shape: Tuple[int, int, int]) -> int:
-        return 0  # No parameters
-    
-    def calculate_receptive_field(self, input_rf: int, input_stride: int) -> Tuple[int, int]:
-        return input_rf, input_stride  # No change in RF
-    
-    def get_layer_info(self) -> Dict[str, Any]:
-        return {
+        self._info = {
             'type': 'Activation',
             'activation': self.activation
         }
@@ -317,8 +343,8 @@ LAYER_TYPES = {
 
 def create_layer(layer_type: str, **kwargs) -> Layer:
     """Create a layer instance from type and parameters."""
-    if layer_type.lower() not in LAYER_TYPES:
+    layer_class = LAYER_TYPES.get(layer_type.lower())
+    if layer_class is None:
         raise ValueError(f"Unknown layer type: {layer_type}")
     
-    layer_class = LAYER_TYPES[layer_type.lower()]
     return layer_class(**kwargs)
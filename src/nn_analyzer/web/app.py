@@ -1,24 +1,53 @@
 """FastAPI web application for neural network analyzer."""
 
-from fastapi import FastAPI, Request, Form, HTTPException
+from fastapi import FastAPI, Request, Form, HTTPException, Header, Depends
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
-from typing import Optional, List, Dict, Any
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+from typing import Optional, List, Dict, Any, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
 import json
 import os
+import secrets
 from pathlib import Path
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 from ..core.analyzer import NetworkAnalyzer
-from ..core.layers import create_layer, LAYER_TYPES
+from ..core.layers import Layer, create_layer, LAYER_TYPES
 from ..core.diagram_generator import DiagramGenerator
+from .sessions import AnalyzerStore
 
 # Get the project root directory
 project_root = Path(__file__).parent.parent.parent.parent
 templates_dir = project_root / "templates"
 static_dir = project_root / "static"
 
-app = FastAPI(title="Neural Network Analyzer", version="1.0.0")
+
+def _dumps(content: Any) -> bytes:
+    """Encode JSON with orjson, falling back to the stdlib for integers wider than 64 bits."""
+    try:
+        return orjson.dumps(content)
+    except orjson.JSONEncodeError:
+        # e.g. the effective stride of a very deep strided network
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson where it can represent the content."""
+    
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
+
+app = FastAPI(
+    title="Neural Network Analyzer",
+    version="1.0.0",
+    default_response_class=FastJSONResponse
+)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
@@ -26,19 +55,68 @@ app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 # Setup templates
 templates = Jinja2Templates(directory=str(templates_dir))
 
-# Global analyzer instance (in production, you'd use sessions or database)
-analyzer = NetworkAnalyzer((224, 224, 3))  # Default input shape
+# One analyzer per client session, identified by the X-Session-ID header
+analyzer_store = AnalyzerStore((224, 224, 3))  # Default input shape
+
+
+async def get_analyzer(x_session_id: Optional[str] = Header(None)) -> NetworkAnalyzer:
+    """Get the requesting session's analyzer; clients without a session id share one."""
+    return analyzer_store.get(x_session_id or "default")
+
 diagram_generator = DiagramGenerator()
 
+# Rendering is CPU-bound, so it runs off the event loop. A single worker keeps
+# renders serialized, as the generator reuses one matplotlib figure.
+diagram_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diagram")
+
+# Rendered (image, table) pairs keyed by (network version, diagram flag)
+_DIAGRAM_CACHE_SIZE = 16
+_diagram_cache: "OrderedDict[Tuple[int, bool], Tuple[Optional[str], str]]" = OrderedDict()
+
+
+def _render_diagram(snapshot: NetworkAnalyzer, diagram: bool) -> Tuple[Optional[str], str]:
+    """Render the diagram image and layer table for a network snapshot."""
+    image_base64 = diagram_generator.generate_diagram_lazy(snapshot) if diagram else None
+    table_html = diagram_generator.generate_detailed_table(snapshot)
+    return image_base64, table_html
+
+
+def _etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already names this ETag."""
+    header = request.headers.get("if-none-match")
+    return header is not None and etag in (tag.strip() for tag in header.split(","))
+
+
+def _not_modified_response(etag: str) -> Response:
+    """Empty 304 response for a representation the client already has."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def _etag_json_response(request: Request, etag: str, body: bytes) -> Response:
+    """Serve pre-encoded JSON that clients must revalidate, answering 304 when unchanged."""
+    if _not_modified(request, etag):
+        return _not_modified_response(etag)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
+
 
 @app.get("/", response_class=HTMLResponse)
-async def home(request: Request):
+async def home(request: Request, analyzer: NetworkAnalyzer = Depends(get_analyzer)):
     """Home page with the neural network builder interface."""
+    summary, layers = analyzer.get_analysis()
     return templates.TemplateResponse("index.html", {
         "request": request,
         "layer_types": list(LAYER_TYPES.keys()),
-        "current_layers": analyzer.get_layer_details(),
-        "summary": analyzer.get_analysis_summary()
+        "current_layers": layers,
+        "summary": summary
     })
 
 
@@ -46,21 +124,94 @@ async def home(request: Request):
 async def set_input_shape(
     height: int = Form(...),
     width: int = Form(...), 
-    channels: int = Form(...)
+    channels: int = Form(...),
+    analyzer: NetworkAnalyzer = Depends(get_analyzer)
 ):
     """Set the input shape for the network."""
-    global analyzer
     try:
-        analyzer = NetworkAnalyzer((height, width, channels))
-        return JSONResponse({
+        analyzer.reset((height, width, channels))
+        return {
             "status": "success",
             "message": f"Input shape set to {height}×{width}×{channels}",
-            "summary": analyzer.get_analysis_summary()
-        })
+            "summary": analyzer.get_analysis()[0]
+        }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _create_conv2d_layer(form: Dict[str, Any]) -> Layer:
+    if not form['filters'] or not form['kernel_size']:
+        raise ValueError("Conv2D layer requires filters and kernel_size")
+    return create_layer(
+        form['layer_type'],
+        filters=form['filters'],
+        kernel_size=form['kernel_size'],
+        stride=form['stride'],
+        padding=form['padding'],
+        activation=form['activation'],
+        name=form['name']
+    )
+
+
+def _create_pool_layer(form: Dict[str, Any]) -> Layer:
+    if not form['pool_size']:
+        raise ValueError(f"{form['layer_type']} layer requires pool_size")
+    return create_layer(
+        form['layer_type'],
+        pool_size=form['pool_size'],
+        stride=form['stride'],
+        padding=form['padding'],
+        name=form['name']
+    )
+
+
+def _create_dropout_layer(form: Dict[str, Any]) -> Layer:
+    return create_layer(form['layer_type'], rate=form['rate'], name=form['name'])
+
+
+def _create_dense_layer(form: Dict[str, Any]) -> Layer:
+    if not form['units']:
+        raise ValueError("Dense layer requires units")
+    return create_layer(
+        form['layer_type'],
+        units=form['units'],
+        activation=form['activation'],
+        use_bias=form['use_bias'],
+        name=form['name']
+    )
+
+
+def _create_activation_layer(form: Dict[str, Any]) -> Layer:
+    return create_layer(form['layer_type'], activation=form['activation'], name=form['name'])
+
+
+def _create_name_only_layer(form: Dict[str, Any]) -> Layer:
+    return create_layer(form['layer_type'], name=form['name'])
+
+
+# Creates the layer from the /add_layer form fields, keyed by lower-case layer type.
+# Every layer defaults its name when given None, so no arguments need filtering.
+_ADD_LAYER_HANDLERS = {
+    'conv2d': _create_conv2d_layer,
+    'maxpool2d': _create_pool_layer,
+    'avgpool2d': _create_pool_layer,
+    'dropout': _create_dropout_layer,
+    'dense': _create_dense_layer,
+    'activation': _create_activation_layer,
+    'batchnorm': _create_name_only_layer,
+    'globalavgpool2d': _create_name_only_layer,
+    'flatten': _create_name_only_layer,
+}
+
+
+def _create_layer_from_form(form: Dict[str, Any]) -> Layer:
+    """Create a layer from /add_layer form fields, checking its required fields."""
+    handler = _ADD_LAYER_HANDLERS.get(form['layer_type'].lower())
+    if handler is None:
+        raise ValueError(f"Unknown layer type: {form['layer_type']}")
+    return handler(form)
+
+
 @app.post("/add_layer")
 async def add_layer(
     layer_type: str = Form(...),
@@ -78,216 +229,279 @@ async def add_layer(
     units: Optional[int] = Form(None),
     use_bias: Optional[bool] = Form(True),
     # General parameters
-    name: Optional[str] = Form(None)
+    name: Optional[str] = Form(None),
+    analyzer: NetworkAnalyzer = Depends(get_analyzer)
 ):
     """Add a layer to the network."""
     try:
-        layer_params = {}
-        
-        if layer_type.lower() == 'conv2d':
-            if not filters or not kernel_size:
-                raise ValueError("Conv2D layer requires filters and kernel_size")
-            layer_params = {
-                'filters': filters,
-                'kernel_size': kernel_size,
-                'stride': stride,
-                'padding': padding,
-                'activation': activation,
-                'name': name
-            }
-        elif layer_type.lower() in ['maxpool2d', 'avgpool2d']:
-            if not pool_size:
-                raise ValueError(f"{layer_type} layer requires pool_size")
-            layer_params = {
-                'pool_size': pool_size,
-                'stride': stride,
-                'padding': padding,
-                'name': name
-            }
-        elif layer_type.lower() == 'dropout':
-            layer_params = {
-                'rate': rate,
-                'name': name
-            }
-        elif layer_type.lower() == 'dense':
-            if not units:
-                raise ValueError("Dense layer requires units")
-            layer_params = {
-                'units': units,
-                'activation': activation,
-                'use_bias': use_bias,
-                'name': name
-            }
-        elif layer_type.lower() == 'activation':
-            layer_params = {
-                'activation': activation,
-                'name': name
-            }
-        elif layer_type.lower() in ['batchnorm', 'globalavgpool2d', 'flatten']:
-            layer_params = {'name': name}
-        
-        # Filter out None values
-        layer_params = {k: v for k, v in layer_params.items() if v is not None}
-        
-        layer = create_layer(layer_type, **layer_params)
+        layer = _create_layer_from_form({
+            'layer_type': layer_type,
+            'filters': filters,
+            'kernel_size': kernel_size,
+            'stride': stride,
+            'padding': padding,
+            'activation': activation,
+            'pool_size': pool_size,
+            'rate': rate,
+            'units': units,
+            'use_bias': use_bias,
+            'name': name
+        })
         analyzer.add_layer(layer)
         
-        return JSONResponse({
+        summary, layers = analyzer.get_analysis()
+        return {
             "status": "success",
             "message": f"{layer_type} layer added successfully",
-            "layers": analyzer.get_layer_details(),
-            "summary": analyzer.get_analysis_summary()
-        })
+            "layers": layers,
+            "summary": summary
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+class LayerParams(BaseModel):
+    """Parameters of a layer to add; the same fields and defaults as the /add_layer form."""
+    model_config = ConfigDict(extra='forbid')
+    
+    filters: Optional[int] = None
+    kernel_size: Optional[int] = None
+    stride: Optional[int] = 1
+    padding: Optional[str] = "valid"
+    activation: Optional[str] = "relu"
+    pool_size: Optional[int] = None
+    rate: Optional[float] = 0.5
+    units: Optional[int] = None
+    use_bias: Optional[bool] = True
+    name: Optional[str] = None
+
+
+class LayerSpec(BaseModel):
+    """A layer to add: its type and parameters."""
+    type: str
+    params: LayerParams = Field(default_factory=LayerParams)
+
+
+def _add_layers(analyzer: NetworkAnalyzer, specs: List[LayerSpec]) -> None:
+    """Create layers from specs and add them as one change."""
+    # Create every layer first so an invalid spec leaves the network untouched;
+    # the analyzer then adds all of them or none
+    layers = [
+        _create_layer_from_form({'layer_type': spec.type, **spec.params.model_dump()})
+        for spec in specs
+    ]
+    analyzer.add_layers(layers)
+
+
+@app.post("/add_layers")
+async def add_layers(
+    layers: List[LayerSpec],
+    analyzer: NetworkAnalyzer = Depends(get_analyzer)
+):
+    """Add several layers to the network in one request."""
+    try:
+        _add_layers(analyzer, layers)
+        
+        summary, details = analyzer.get_analysis()
+        return {
+            "status": "success",
+            "message": f"{len(layers)} layers added successfully",
+            "layers_added": len(layers),
+            "layers": details,
+            "summary": summary
+        }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/remove_layer/{layer_index}")
-async def remove_layer(layer_index: int):
+async def remove_layer(layer_index: int, analyzer: NetworkAnalyzer = Depends(get_analyzer)):
     """Remove a layer from the network."""
     try:
         analyzer.remove_layer(layer_index)
-        return JSONResponse({
+        summary, layers = analyzer.get_analysis()
+        return {
             "status": "success",
             "message": "Layer removed successfully",
-            "layers": analyzer.get_layer_details(),
-            "summary": analyzer.get_analysis_summary()
-        })
+            "layers": layers,
+            "summary": summary
+        }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/clear_layers")
-async def clear_layers():
+async def clear_layers(analyzer: NetworkAnalyzer = Depends(get_analyzer)):
     """Clear all layers from the network."""
     try:
         analyzer.clear_layers()
-        return JSONResponse({
+        return {
             "status": "success",
             "message": "All layers cleared",
             "layers": [],
-            "summary": analyzer.get_analysis_summary()
-        })
+            "summary": analyzer.get_analysis()[0]
+        }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# Encoded /get_analysis body for the network version it was built from
+_analysis_body: Tuple[int, bytes] = (0, b"")
+
+# Versions restart with every process, so ETags also carry an id for this one
+_BOOT_ID = secrets.token_hex(8)
+
+
 @app.get("/get_analysis")
-async def get_analysis():
-    """Get the current network analysis."""
-    return JSONResponse({
-        "layers": analyzer.get_layer_details(),
-        "summary": analyzer.get_analysis_summary(),
-        "input_shape": analyzer.input_shape
-    })
+async def get_analysis(request: Request, analyzer: NetworkAnalyzer = Depends(get_analyzer)):
+    """Get the current network analysis (304 if the client's version is current)."""
+    global _analysis_body
+    snapshot = analyzer.snapshot()
+    etag = f'"{_BOOT_ID}-v{snapshot.version}"'
+    if _not_modified(request, etag):
+        return _not_modified_response(etag)
+    
+    version, body = _analysis_body
+    if version != snapshot.version:
+        body = _dumps({
+            "layers": snapshot.details,
+            "summary": snapshot.summary,
+            "input_shape": snapshot.input_shape
+        })
+        _analysis_body = (snapshot.version, body)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
 
 
 @app.post("/generate_diagram")
-async def generate_diagram():
-    """Generate and return the network architecture diagram."""
+async def generate_diagram(diagram: bool = True, analyzer: NetworkAnalyzer = Depends(get_analyzer)):
+    """Generate and return the network architecture diagram (skipped with ?diagram=false)."""
     try:
-        if not analyzer.layers:
+        snapshot = analyzer.snapshot()
+        if not snapshot.layers:
             raise ValueError("No layers added to the network")
         
-        # Generate diagram
-        image_base64 = diagram_generator.generate_diagram(analyzer)
-        
-        # Generate detailed table
-        table_html = diagram_generator.generate_detailed_table(analyzer)
+        summary = snapshot.summary
+        key = (snapshot.version, diagram)
+        rendered = _diagram_cache.get(key)
+        if rendered is None:
+            # Render a copy so that the network can keep changing meanwhile
+            network = analyzer.copy()
+            summary = network.get_analysis()[0]
+            key = (network.version, diagram)
+            rendered = await asyncio.get_running_loop().run_in_executor(
+                diagram_executor, _render_diagram, network, diagram
+            )
+            _diagram_cache[key] = rendered
+            if len(_diagram_cache) > _DIAGRAM_CACHE_SIZE:
+                _diagram_cache.popitem(last=False)
+        else:
+            _diagram_cache.move_to_end(key)
+        image_base64, table_html = rendered
         
-        return JSONResponse({
+        return {
             "status": "success",
             "image": image_base64,
             "table": table_html,
-            "summary": analyzer.get_analysis_summary()
-        })
+            "summary": summary
+        }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/export_architecture")
-async def export_architecture():
+async def export_architecture(analyzer: NetworkAnalyzer = Depends(get_analyzer)):
     """Export the complete architecture configuration."""
     try:
         architecture = analyzer.export_architecture()
-        return JSONResponse({
+        return {
             "status": "success",
             "architecture": architecture
-        })
+        }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# Layer type descriptions; static, so encoded once at import
+_LAYER_TYPE_INFO = {
+    'conv2d': {
+        'name': 'Convolutional 2D',
+        'category': 'Feature Extraction',
+        'required': ['filters', 'kernel_size'],
+        'optional': ['stride', 'padding', 'activation', 'name']
+    },
+    'maxpool2d': {
+        'name': 'Max Pooling 2D',
+        'category': 'Feature Extraction',
+        'required': ['pool_size'],
+        'optional': ['stride', 'padding', 'name']
+    },
+    'avgpool2d': {
+        'name': 'Average Pooling 2D',
+        'category': 'Feature Extraction',
+        'required': ['pool_size'],
+        'optional': ['stride', 'padding', 'name']
+    },
+    'batchnorm': {
+        'name': 'Batch Normalization',
+        'category': 'Regularization',
+        'required': [],
+        'optional': ['name']
+    },
+    'dropout': {
+        'name': 'Dropout',
+        'category': 'Regularization',
+        'required': [],
+        'optional': ['rate', 'name']
+    },
+    'globalavgpool2d': {
+        'name': 'Global Average Pooling 2D',
+        'category': 'Feature Extraction',
+        'required': [],
+        'optional': ['name']
+    },
+    'flatten': {
+        'name': 'Flatten',
+        'category': 'Transition',
+        'required': [],
+        'optional': ['name']
+    },
+    'dense': {
+        'name': 'Dense/Linear',
+        'category': 'Output',
+        'required': ['units'],
+        'optional': ['activation', 'use_bias', 'name']
+    },
+    'activation': {
+        'name': 'Activation',
+        'category': 'Activation',
+        'required': ['activation'],
+        'optional': ['name']
+    }
+}
+
+_LAYER_TYPES_BYTES = orjson.dumps(_LAYER_TYPE_INFO)
+_LAYER_TYPES_ETAG = _etag(_LAYER_TYPES_BYTES)
+
+
 @app.get("/layer_types")
-async def get_layer_types():
+async def get_layer_types(request: Request):
     """Get available layer types and their required parameters."""
-    layer_info = {
-        'conv2d': {
-            'name': 'Convolutional 2D',
-            'category': 'Feature Extraction',
-            'required': ['filters', 'kernel_size'],
-            'optional': ['stride', 'padding', 'activation', 'name']
-        },
-        'maxpool2d': {
-            'name': 'Max Pooling 2D',
-            'category': 'Feature Extraction',
-            'required': ['pool_size'],
-            'optional': ['stride', 'padding', 'name']
-        },
-        'avgpool2d': {
-            'name': 'Average Pooling 2D',
-            'category': 'Feature Extraction',
-            'required': ['pool_size'],
-            'optional': ['stride', 'padding', 'name']
-        },
-        'batchnorm': {
-            'name': 'Batch Normalization',
-            'category': 'Regularization',
-            'required': [],
-            'optional': ['name']
-        },
-        'dropout': {
-            'name': 'Dropout',
-            'category': 'Regularization',
-            'required': [],
-            'optional': ['rate', 'name']
-        },
-        'globalavgpool2d': {
-            'name': 'Global Average Pooling 2D',
-            'category': 'Feature Extraction',
-            'required': [],
-            'optional': ['name']
-        },
-        'flatten': {
-            'name': 'Flatten',
-            'category': 'Transition',
-            'required': [],
-            'optional': ['name']
-        },
-        'dense': {
-            'name': 'Dense/Linear',
-            'category': 'Output',
-            'required': ['units'],
-            'optional': ['activation', 'use_bias', 'name']
-        },
-        'activation': {
-            'name': 'Activation',
-            'category': 'Activation',
-            'required': ['activation'],
-            'optional': ['name']
-        }
-    }
-    
-    return JSONResponse(layer_info)
+    return _etag_json_response(request, _LAYER_TYPES_ETAG, _LAYER_TYPES_BYTES)
 
 
 @app.post("/configure_problem")
 async def configure_problem(
     problem_type: str = Form(...),
     num_classes: Optional[int] = Form(None),
-    output_activation: Optional[str] = Form("softmax")
+    output_activation: Optional[str] = Form("softmax"),
+    analyzer: NetworkAnalyzer = Depends(get_analyzer)
 ):
     """Configure the problem type and add appropriate output layers."""
     try:
@@ -298,78 +512,82 @@ async def configure_problem(
                 raise ValueError("Classification requires number of classes")
             
             # Add output layer for classification
-            layers_to_add.append({
-                'type': 'dense',
-                'params': {
-                    'units': num_classes,
-                    'activation': output_activation,
-                    'name': f'Classification_Output_{num_classes}'
-                }
-            })
+            layers_to_add.append(LayerSpec(
+                type='dense',
+                params=LayerParams(
+                    units=num_classes,
+                    activation=output_activation,
+                    name=f'Classification_Output_{num_classes}'
+                )
+            ))
             
         elif problem_type == "regression":
             output_units = num_classes if num_classes else 1
-            layers_to_add.append({
-                'type': 'dense',
-                'params': {
-                    'units': output_units,
-                    'activation': 'linear',
-                    'name': f'Regression_Output_{output_units}'
-                }
-            })
+            layers_to_add.append(LayerSpec(
+                type='dense',
+                params=LayerParams(
+                    units=output_units,
+                    activation='linear',
+                    name=f'Regression_Output_{output_units}'
+                )
+            ))
             
         elif problem_type == "binary_classification":
-            layers_to_add.append({
-                'type': 'dense',
-                'params': {
-                    'units': 1,
-                    'activation': 'sigmoid',
-                    'name': 'Binary_Classification_Output'
-                }
-            })
+            layers_to_add.append(LayerSpec(
+                type='dense',
+                params=LayerParams(
+                    units=1,
+                    activation='sigmoid',
+                    name='Binary_Classification_Output'
+                )
+            ))
         
         # Add the layers to the network
-        for layer_config in layers_to_add:
-            layer = create_layer(layer_config['type'], **layer_config['params'])
-            analyzer.add_layer(layer)
+        _add_layers(analyzer, layers_to_add)
         
-        return JSONResponse({
+        summary, layers = analyzer.get_analysis()
+        return {
             "status": "success",
             "message": f"Configured for {problem_type}",
             "layers_added": len(layers_to_add),
-            "layers": analyzer.get_layer_details(),
-            "summary": analyzer.get_analysis_summary()
-        })
+            "layers": layers,
+            "summary": summary
+        }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# Problem type descriptions; static, so encoded once at import
+_PROBLEM_TYPES = {
+    'classification': {
+        'name': 'Multi-class Classification',
+        'description': 'Classify input into one of multiple classes',
+        'requires_classes': True,
+        'default_activation': 'softmax'
+    },
+    'binary_classification': {
+        'name': 'Binary Classification',
+        'description': 'Classify input into one of two classes',
+        'requires_classes': False,
+        'default_activation': 'sigmoid'
+    },
+    'regression': {
+        'name': 'Regression',
+        'description': 'Predict continuous numerical values',
+        'requires_classes': False,
+        'default_activation': 'linear'
+    }
+}
+
+_PROBLEM_TYPES_BYTES = orjson.dumps(_PROBLEM_TYPES)
+_PROBLEM_TYPES_ETAG = _etag(_PROBLEM_TYPES_BYTES)
+
+
 @app.get("/problem_types")
-async def get_problem_types():
+async def get_problem_types(request: Request):
     """Get available problem types."""
-    problem_types = {
-        'classification': {
-            'name': 'Multi-class Classification',
-            'description': 'Classify input into one of multiple classes',
-            'requires_classes': True,
-            'default_activation': 'softmax'
-        },
-        'binary_classification': {
-            'name': 'Binary Classification',
-            'description': 'Classify input into one of two classes',
-            'requires_classes': False,
-            'default_activation': 'sigmoid'
-        },
-        'regression': {
-            'name': 'Regression',
-            'description': 'Predict continuous numerical values',
-            'requires_classes': False,
-            'default_activation': 'linear'
-        }
-    }
-    
-    return JSONResponse(problem_types)
+    return _etag_json_response(request, _PROBLEM_TYPES_ETAG, _PROBLEM_TYPES_BYTES)
 
 
 if __name__ == "__main__":
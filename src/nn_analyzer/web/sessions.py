@@ -0,0 +1,57 @@
+"""Per-session analyzer storage for the web application."""
+
+from collections import OrderedDict
+from typing import Tuple
+import threading
+import time
+
+from ..core.analyzer import NetworkAnalyzer
+
+
+class AnalyzerStore:
+    """
+    Keeps one NetworkAnalyzer per session id.
+
+    Sessions are dropped once idle for longer than `ttl` seconds, or least
+    recently used first when more than `maxsize` are held.
+    """
+
+    def __init__(self, input_shape: Tuple[int, int, int], maxsize: int = 1000, ttl: float = 3600.0):
+        """
+        Initialize an empty store.
+
+        Args:
+            input_shape: Input shape given to the analyzers of new sessions
+            maxsize: Maximum number of sessions kept
+            ttl: Seconds of inactivity after which a session is dropped
+        """
+        self.input_shape = input_shape
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        # session id -> (analyzer, last access time), least recently used first
+        self._sessions: "OrderedDict[str, Tuple[NetworkAnalyzer, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> NetworkAnalyzer:
+        """Get the analyzer for a session, creating it if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None and now - entry[1] <= self.ttl:
+                analyzer = entry[0]
+            else:
+                analyzer = NetworkAnalyzer(self.input_shape)
+            self._sessions[session_id] = (analyzer, now)
+
+            # Evict from the least recently used end
+            sessions = self._sessions
+            while sessions:
+                _, last_access = next(iter(sessions.values()))
+                if len(sessions) <= self.maxsize and now - last_access <= self.ttl:
+                    break
+                sessions.popitem(last=False)
+        return analyzer
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -2,11 +2,31 @@
 
 class NeuralNetworkAnalyzer {
     constructor() {
+        this.sessionId = this.getSessionId();
         this.initializeEventListeners();
         this.initializeLayerParameters();
         this.loadInitialState();
     }
 
+    getSessionId() {
+        // Each browser keeps its own network on the server, keyed by this id
+        let sessionId = localStorage.getItem('nnAnalyzerSessionId');
+        if (!sessionId) {
+            sessionId = window.crypto && crypto.randomUUID
+                ? crypto.randomUUID()
+                : Date.now().toString(36) + Math.random().toString(36).slice(2);
+            localStorage.setItem('nnAnalyzerSessionId', sessionId);
+        }
+        return sessionId;
+    }
+
+    api(url, options = {}) {
+        return fetch(url, {
+            ...options,
+            headers: {...options.headers, 'X-Session-ID': this.sessionId}
+        });
+    }
+
     initializeEventListeners() {
         // Input shape form
         document.getElementById('inputShapeForm').addEventListener('submit', (e) => {
@@ -276,7 +296,7 @@ class NeuralNetworkAnalyzer {
         const formData = new FormData(document.getElementById('problemForm'));
         
         try {
-            const response = await fetch('/configure_problem', {
+            const response = await this.api('/configure_problem', {
                 method: 'POST',
                 body: formData
             });
@@ -306,7 +326,7 @@ class NeuralNetworkAnalyzer {
         const formData = new FormData(document.getElementById('inputShapeForm'));
         
         try {
-            const response = await fetch('/set_input_shape', {
+            const response = await this.api('/set_input_shape', {
                 method: 'POST',
                 body: formData
             });
@@ -330,7 +350,7 @@ class NeuralNetworkAnalyzer {
         const formData = new FormData(document.getElementById('layerForm'));
         
         try {
-            const response = await fetch('/add_layer', {
+            const response = await this.api('/add_layer', {
                 method: 'POST',
                 body: formData
             });
@@ -353,7 +373,7 @@ class NeuralNetworkAnalyzer {
 
     async removeLayer(layerIndex) {
         try {
-            const response = await fetch(`/remove_layer/${layerIndex}`, {
+            const response = await this.api(`/remove_layer/${layerIndex}`, {
                 method: 'POST'
             });
             
@@ -379,7 +399,7 @@ class NeuralNetworkAnalyzer {
         }
         
         try {
-            const response = await fetch('/clear_layers', {
+            const response = await this.api('/clear_layers', {
                 method: 'POST'
             });
             
@@ -411,16 +431,18 @@ class NeuralNetworkAnalyzer {
         diagram.style.display = 'none';
         
         try {
-            const response = await fetch('/generate_diagram', {
+            const response = await this.api('/generate_diagram', {
                 method: 'POST'
             });
             
             const result = await response.json();
             
             if (response.ok) {
-                // Display diagram
-                diagram.src = `data:image/png;base64,${result.image}`;
-                diagram.style.display = 'block';
+                // Display diagram (absent when rendering was skipped)
+                if (result.image) {
+                    diagram.src = `data:image/png;base64,${result.image}`;
+                    diagram.style.display = 'block';
+                }
                 
                 // Display analysis table
                 document.getElementById('analysisTable').innerHTML = result.table;
@@ -442,7 +464,7 @@ class NeuralNetworkAnalyzer {
 
     async exportArchitecture() {
         try {
-            const response = await fetch('/export_architecture');
+            const response = await this.api('/export_architecture');
             const result = await response.json();
             
             if (response.ok) {
@@ -466,7 +488,7 @@ class NeuralNetworkAnalyzer {
 
     async loadInitialState() {
         try {
-            const response = await fetch('/get_analysis');
+            const response = await this.api('/get_analysis');
             const result = await response.json();
             
             this.updateLayersList(result.layers);
@@ -479,7 +501,7 @@ class NeuralNetworkAnalyzer {
 
     async refreshLayers() {
         try {
-            const response = await fetch('/get_analysis');
+            const response = await this.api('/get_analysis');
             const result = await response.json();
             
             this.updateLayersList(result.layers);
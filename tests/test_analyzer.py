@@ -0,0 +1,170 @@
+"""Tests for the network analyzer."""
+
+import pytest
+
+from nn_analyzer.core.analyzer import NetworkAnalyzer
+from nn_analyzer.core.layers import Layer, create_layer
+
+
+def _records(analyzer):
+    return [result.to_dict() for result in analyzer.analysis_results]
+
+
+def _assert_matches_rebuild(analyzer):
+    """The incrementally maintained analysis must equal a full rebuild."""
+    incremental = _records(analyzer)
+    total = analyzer.get_total_parameters()
+
+    analyzer.input_shape = analyzer.input_shape  # forces _update_analysis
+    assert _records(analyzer) == incremental
+    assert analyzer.get_total_parameters() == total
+
+
+def test_receptive_field_past_rf_infinity():
+    analyzer = NetworkAnalyzer((224, 224, 3))
+    for _ in range(31):
+        analyzer.add_layer(create_layer('maxpool2d', pool_size=2, stride=2, padding='same'))
+
+    rfs = [result.receptive_field for result in analyzer.analysis_results[-3:]]
+    assert rfs == [2 ** 29, 2 ** 30, 2 ** 31]
+    _assert_matches_rebuild(analyzer)
+
+
+MIXED_LAYERS = [
+    ('conv2d', {'filters': 16, 'kernel_size': 3, 'stride': 2, 'padding': 'same'}),
+    ('batchnorm', {}),
+    ('activation', {'activation': 'relu'}),
+    ('maxpool2d', {'pool_size': 2}),
+    ('conv2d', {'filters': 32, 'kernel_size': 5}),
+    ('dropout', {'rate': 0.25}),
+    ('avgpool2d', {'pool_size': 3, 'stride': 2, 'padding': 'same'}),
+    ('globalavgpool2d', {}),
+    ('flatten', {}),
+    ('dense', {'units': 10, 'activation': 'softmax'}),
+]
+
+
+def _mixed_network():
+    analyzer = NetworkAnalyzer((64, 64, 3))
+    for layer_type, params in MIXED_LAYERS:
+        analyzer.add_layer(create_layer(layer_type, **params))
+    return analyzer
+
+
+def test_incremental_add_matches_rebuild():
+    analyzer = _mixed_network()
+
+    summary = analyzer.get_analysis_summary()
+    assert summary['total_layers'] == len(MIXED_LAYERS)
+    assert summary['output_shape'] == (1, 1, 10)
+    assert analyzer.analysis_results[7].receptive_field == 'Global'
+    _assert_matches_rebuild(analyzer)
+
+
+def test_remove_layer_replays_tail():
+    for index in (0, 3, 7, len(MIXED_LAYERS) - 1):
+        analyzer = _mixed_network()
+        analyzer.remove_layer(index)
+
+        assert len(analyzer.analysis_results) == len(MIXED_LAYERS) - 1
+        assert [result.layer_index for result in analyzer.analysis_results] == list(range(len(MIXED_LAYERS) - 1))
+        _assert_matches_rebuild(analyzer)
+
+
+def test_remove_layer_out_of_range_is_ignored():
+    analyzer = _mixed_network()
+    version = analyzer.version
+
+    analyzer.remove_layer(len(MIXED_LAYERS))
+
+    assert analyzer.version == version
+    assert len(analyzer.analysis_results) == len(MIXED_LAYERS)
+
+
+def test_rebuild_does_not_overflow_int64():
+    analyzer = NetworkAnalyzer((224, 224, 3))
+    for _ in range(66):
+        analyzer.add_layer(create_layer('maxpool2d', pool_size=2, stride=2, padding='same'))
+
+    assert analyzer.analysis_results[-1].effective_stride == 2 ** 66
+    _assert_matches_rebuild(analyzer)
+
+
+def test_failed_add_leaves_network_unchanged():
+    analyzer = NetworkAnalyzer((32, 32, 3))
+    analyzer.add_layer(create_layer('conv2d', filters=8, kernel_size=3))
+    version = analyzer.version
+
+    with pytest.raises(ZeroDivisionError):
+        analyzer.add_layer(create_layer('conv2d', filters=8, kernel_size=3, stride=0, padding='same'))
+    with pytest.raises(TypeError):
+        analyzer.add_layer(create_layer('conv2d', filters='x', kernel_size=3))
+
+    assert analyzer.version == version
+    assert len(analyzer.layers) == len(analyzer.analysis_results) == 1
+
+    analyzer.add_layer(create_layer('dense', units=10))
+    assert analyzer.analysis_results[-1].layer_index == 1
+    assert analyzer.analysis_results[-1].input_shape == (30, 30, 8)
+
+    analyzer.remove_layer(1)
+    assert analyzer.get_analysis_summary() == {
+        'input_shape': (32, 32, 3),
+        'output_shape': (30, 30, 8),
+        'total_parameters': 224,
+        'total_layers': 1,
+        'final_receptive_field': 3
+    }
+    _assert_matches_rebuild(analyzer)
+
+
+def test_failed_add_layers_leaves_network_unchanged():
+    analyzer = _mixed_network()
+    records = _records(analyzer)
+    version = analyzer.version
+
+    with pytest.raises(ZeroDivisionError):
+        analyzer.add_layers([
+            create_layer('dense', units=4),
+            create_layer('conv2d', filters=8, kernel_size=3, stride=0, padding='same')
+        ])
+
+    assert analyzer.version == version
+    assert len(analyzer.layers) == len(MIXED_LAYERS)
+    assert _records(analyzer) == records
+    assert analyzer.get_total_parameters() == sum(record['parameters'] for record in records)
+
+    analyzer.add_layers([create_layer('dense', units=4)])
+    assert analyzer.analysis_results[-1].input_shape == (1, 1, 10)
+    _assert_matches_rebuild(analyzer)
+
+def test_rebuild_uses_calculate_receptive_field():
+    class DilatedPoolLayer(Layer):
+        """Layer implementing only the documented abstract methods."""
+
+        __slots__ = ()
+
+        def __init__(self):
+            super().__init__("DilatedPool")
+            self._info = {'type': 'DilatedPool'}
+
+        def calculate_output_shape(self, input_shape):
+            h, w, c = input_shape
+            return (h // 2, w // 2, c)
+
+        def calculate_parameters(self, input_shape):
+            return 0
+
+        def calculate_receptive_field(self, input_rf, input_stride):
+            return input_rf + 4 * input_stride, input_stride * 2
+
+        def get_layer_info(self):
+            return self._info
+
+    analyzer = NetworkAnalyzer((64, 64, 3))
+    analyzer.add_layer(create_layer('conv2d', filters=8, kernel_size=3))
+    analyzer.add_layer(DilatedPoolLayer())
+    analyzer.add_layer(create_layer('conv2d', filters=8, kernel_size=3))
+
+    assert [result.receptive_field for result in analyzer.analysis_results] == [3, 7, 11]
+    _assert_matches_rebuild(analyzer)
@@ -0,0 +1,97 @@
+"""Tests for the web API."""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from nn_analyzer.web.app import app
+
+
+@pytest.fixture
+def client():
+    """Test client with its own analyzer session."""
+    with TestClient(app, headers={"X-Session-ID": uuid.uuid4().hex}) as client:
+        client.post("/set_input_shape", data={"height": 32, "width": 32, "channels": 3})
+        yield client
+
+
+def test_add_layer_honors_stride(client):
+    response = client.post("/add_layer", data={
+        "layer_type": "conv2d",
+        "filters": 8,
+        "kernel_size": 3,
+        "stride": 2,
+        "padding": "same"
+    })
+
+    assert response.status_code == 200
+    layer = response.json()["layers"][-1]
+    assert layer["layer_info"]["stride"] == 2
+    assert layer["effective_stride"] == 2
+    assert layer["output_shape"] == [16, 16, 8]
+
+
+def test_get_analysis_revalidates_by_etag(client):
+    etag = client.get("/get_analysis").headers["etag"]
+    assert client.get("/get_analysis", headers={"If-None-Match": etag}).status_code == 304
+
+    # A tag for the same version from another process must not match
+    version = etag.rsplit("-", 1)[1]
+    other_process = client.get("/get_analysis", headers={"If-None-Match": f'"0-{version}'})
+    assert other_process.status_code == 200
+
+    client.post("/add_layer", data={"layer_type": "flatten"})
+    response = client.get("/get_analysis", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["layers"]) == 1
+
+
+def test_integers_wider_than_64_bits_are_encoded(client):
+    for _ in range(64):
+        response = client.post("/add_layer", data={
+            "layer_type": "maxpool2d",
+            "pool_size": 2,
+            "stride": 2,
+            "padding": "same"
+        })
+        assert response.status_code == 200
+
+    assert response.json()["layers"][-1]["effective_stride"] == 2 ** 64
+    response = client.get("/get_analysis")
+    assert response.status_code == 200
+    assert response.json()["layers"][-1]["effective_stride"] == 2 ** 64
+
+
+def test_add_layers_is_all_or_nothing(client):
+    client.post("/add_layer", data={"layer_type": "flatten"})
+    etag = client.get("/get_analysis").headers["etag"]
+
+    response = client.post("/add_layers", json=[
+        {"type": "dense", "params": {"units": 4}},
+        {"type": "conv2d", "params": {"filters": 8, "kernel_size": 3, "stride": 0, "padding": "same"}}
+    ])
+    assert response.status_code == 400
+
+    response = client.post("/add_layers", json=[
+        {"type": "dense", "params": {"units": 4}},
+        {"type": "conv2d", "params": {"kernel_size": 3}}
+    ])
+    assert response.status_code == 400
+    assert "requires filters" in response.json()["detail"]
+
+    assert client.get("/get_analysis", headers={"If-None-Match": etag}).status_code == 304
+
+
+@pytest.mark.parametrize("params", [
+    {"filters": "x", "kernel_size": 3},
+    {"filters": 8, "kernel_size": 3, "rate": [1]},
+    {"filters": 8, "kernel_size": 3, "dilation": 2},
+])
+def test_add_layers_validates_params(client, params):
+    response = client.post("/add_layers", json=[
+        {"type": "dense", "params": {"units": 4}},
+        {"type": "conv2d", "params": params}
+    ])
+    assert response.status_code == 422
+    assert client.get("/get_analysis").json()["layers"] == []
@@ -0,0 +1,54 @@
+"""Tests for diagram rendering and its image cache."""
+
+import base64
+import io
+
+import pytest
+from PIL import Image
+
+from nn_analyzer.core.analyzer import NetworkAnalyzer
+from nn_analyzer.core.diagram_generator import DiagramGenerator
+from nn_analyzer.core.layers import create_layer
+
+
+def _network(*layers):
+    analyzer = NetworkAnalyzer((32, 32, 3))
+    for layer_type, params in layers:
+        analyzer.add_layer(create_layer(layer_type, **params))
+    return analyzer
+
+
+def _image_size(image_base64):
+    return Image.open(io.BytesIO(base64.b64decode(image_base64))).size
+
+
+def test_cached_image_depends_on_dpi():
+    generator = DiagramGenerator()
+    analyzer = _network(('conv2d', {'filters': 8, 'kernel_size': 3}))
+
+    large = generator.generate_diagram(analyzer, dpi=100)
+    small = generator.generate_diagram(analyzer, dpi=50)
+
+    assert _image_size(small)[0] < _image_size(large)[0]
+    assert generator.generate_diagram(analyzer, dpi=100) == large
+
+
+def test_failed_render_is_not_reused(monkeypatch):
+    generator = DiagramGenerator()
+    first = generator.generate_diagram(_network(('dense', {'units': 10})))
+
+    analyzer = _network(('conv2d', {'filters': 8, 'kernel_size': 3}))
+    add_legend = generator._add_legend
+
+    def failing_add_legend(*args):
+        monkeypatch.setattr(generator, '_add_legend', add_legend)
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(generator, '_add_legend', failing_add_legend)
+    with pytest.raises(RuntimeError):
+        generator.generate_diagram(analyzer)
+
+    retry = generator.generate_diagram(analyzer)
+    assert retry is not None
+    assert retry != first
+    assert retry == DiagramGenerator().generate_diagram(analyzer)